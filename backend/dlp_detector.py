@@ -22,10 +22,33 @@ Usage:
 
 import re
 from enum import Enum
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, Iterator, List, Tuple, Optional, Pattern, Match
 from dataclasses import dataclass
 
 
+# Luhn doubling step as a lookup: digit -> 2 * digit, minus 9 when above 9
+_LUHN_DOUBLED = str.maketrans("0123456789", "0246813579")
+
+# ASCII characters matched by \s only in Unicode (non re.ASCII) mode
+_ASCII_UNICODE_SPACES = "\x1c\x1d\x1e\x1f"
+
+# Categories in which every pattern requires an ASCII digit ([0-9])
+_DIGIT_CATEGORIES = frozenset({
+    "credit_card", "cvv", "ssn", "nric", "passport", "pin", "address", "dob",
+})
+
+_ASCII_DIGIT = re.compile(r'[0-9]')
+
+# Categories whose matches are masked completely
+_FULLY_MASKED_CATEGORIES = frozenset({"password", "pin", "api_key", "cvv"})
+
+
+def _strip_separators(text: str) -> str:
+    """Remove dashes and whitespace (equivalent to re.sub(r'[-\\s]', '', text))"""
+    # str.split() splits on exactly the characters \s matches in str patterns
+    return "".join(text.split()).replace("-", "")
+
+
 class SensitivityLevel(str, Enum):
     """Sensitivity levels for detected data"""
     CRITICAL = "critical"   # Credit cards, SSN, passwords
@@ -35,9 +58,29 @@ class SensitivityLevel(str, Enum):
     NONE = "none"           # No sensitive data
 
 
+# Numeric rank on each member so comparisons are a plain attribute lookup
+SensitivityLevel.NONE.rank = 0
+SensitivityLevel.LOW.rank = 1
+SensitivityLevel.MEDIUM.rank = 2
+SensitivityLevel.HIGH.rank = 3
+SensitivityLevel.CRITICAL.rank = 4
+
+# Fixed recommendation text per level; CRITICAL is formatted with the categories
+_RECOMMENDATIONS = {
+    SensitivityLevel.NONE: "✅ No sensitive data detected. Safe to send.",
+    SensitivityLevel.LOW: "ℹ️ Low sensitivity data detected. Consider if the recipient needs this information.",
+    SensitivityLevel.MEDIUM: "⚠️ Medium sensitivity data detected. Verify you trust the recipient before sending.",
+    SensitivityLevel.HIGH: "🔶 High sensitivity data detected! Only send if absolutely necessary and to trusted recipients.",
+}
+
+
 @dataclass
 class SensitiveMatch:
     """Represents a detected sensitive data match"""
+    # No per-instance __dict__: analyze() may build one of these per regex hit
+    __slots__ = ("category", "pattern_name", "matched_text", "masked_text",
+                 "sensitivity", "start_pos", "end_pos", "confidence")
+    
     category: str
     pattern_name: str
     matched_text: str
@@ -46,6 +89,21 @@ class SensitiveMatch:
     start_pos: int
     end_pos: int
     confidence: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to the match format returned by DLPDetector.analyze"""
+        return {
+            "category": self.category,
+            "description": self.pattern_name,
+            "matched_text": self.matched_text,
+            "masked_text": self.masked_text,
+            "sensitivity": self.sensitivity.value,
+            "confidence": self.confidence,
+            "position": {
+                "start": self.start_pos,
+                "end": self.end_pos
+            }
+        }
 
 
 class DLPDetector:
@@ -66,168 +124,182 @@ class DLPDetector:
     - Medical: Medical record numbers, health info
     """
     
+    # Pattern tables and compiled regexes, built by the first instance and
+    # shared (read-only) by every later one
+    _shared: Optional[Tuple[Dict, Dict, List, List]] = None
+    
     def __init__(self):
-        self._init_patterns()
+        shared = DLPDetector._shared
+        if shared is None:
+            self._init_patterns()
+            DLPDetector._shared = (
+                self.patterns, self.category_sensitivity, self._compiled, self._compiled_ascii
+            )
+        else:
+            self.patterns, self.category_sensitivity, self._compiled, self._compiled_ascii = shared
     
     def _init_patterns(self):
         """Initialize all detection patterns"""
         
-        # Pattern format: (regex, description, sensitivity, confidence)
-        self.patterns: Dict[str, List[Tuple[str, str, SensitivityLevel, float]]] = {
+        # Pattern format: (regex, description, sensitivity, confidence, keywords)
+        # keywords: lowercase literals of which every match contains at least
+        # one, used to skip the regex cheaply; None when there is no such literal
+        self.patterns: Dict[str, List[Tuple[str, str, SensitivityLevel, float, Optional[Tuple[str, ...]]]]] = {
             
             # ============== FINANCIAL ==============
             "credit_card": [
                 # Visa
                 (r'\b4[0-9]{3}[-\s]?[0-9]{4}[-\s]?[0-9]{4}[-\s]?[0-9]{4}\b',
-                 "Visa card", SensitivityLevel.CRITICAL, 0.95),
+                 "Visa card", SensitivityLevel.CRITICAL, 0.95, None),
                 # MasterCard
                 (r'\b5[1-5][0-9]{2}[-\s]?[0-9]{4}[-\s]?[0-9]{4}[-\s]?[0-9]{4}\b',
-                 "MasterCard", SensitivityLevel.CRITICAL, 0.95),
+                 "MasterCard", SensitivityLevel.CRITICAL, 0.95, None),
                 # American Express
                 (r'\b3[47][0-9]{2}[-\s]?[0-9]{6}[-\s]?[0-9]{5}\b',
-                 "American Express", SensitivityLevel.CRITICAL, 0.95),
+                 "American Express", SensitivityLevel.CRITICAL, 0.95, None),
                 # Discover
                 (r'\b6(?:011|5[0-9]{2})[-\s]?[0-9]{4}[-\s]?[0-9]{4}[-\s]?[0-9]{4}\b',
-                 "Discover card", SensitivityLevel.CRITICAL, 0.95),
+                 "Discover card", SensitivityLevel.CRITICAL, 0.95, None),
                 # Generic 16-digit
                 (r'\b[0-9]{4}[-\s]?[0-9]{4}[-\s]?[0-9]{4}[-\s]?[0-9]{4}\b',
-                 "Credit card number", SensitivityLevel.CRITICAL, 0.70),
+                 "Credit card number", SensitivityLevel.CRITICAL, 0.70, None),
             ],
             
             "bank_account": [
                 # IBAN (International)
                 (r'\b[A-Z]{2}[0-9]{2}[A-Z0-9]{4}[0-9]{7}([A-Z0-9]?){0,16}\b',
-                 "IBAN", SensitivityLevel.HIGH, 0.95),
+                 "IBAN", SensitivityLevel.HIGH, 0.95, None),
                 # Account with context
                 (r'(?i)(?:account|acct|a/c)[\s:#]*([0-9]{8,17})',
-                 "Bank account number", SensitivityLevel.HIGH, 0.85),
+                 "Bank account number", SensitivityLevel.HIGH, 0.85, ("account", "acct", "a/c")),
                 # Routing number with context
                 (r'(?i)(?:routing|rtg|aba)[\s:#]*([0-9]{9})',
-                 "Bank routing number", SensitivityLevel.HIGH, 0.90),
+                 "Bank routing number", SensitivityLevel.HIGH, 0.90, ("routing", "rtg", "aba")),
                 # SWIFT/BIC code
-                (r'\b[A-Z]{4}[A-Z]{2}[A-Z0-9]{2}([A-Z0-9]{3})?\b',
-                 "SWIFT/BIC code", SensitivityLevel.HIGH, 0.80),
+                # (case-sensitive: under IGNORECASE every 8/11-letter word matches)
+                (r'(?-i:\b[A-Z]{4}[A-Z]{2}[A-Z0-9]{2}([A-Z0-9]{3})?\b)',
+                 "SWIFT/BIC code", SensitivityLevel.HIGH, 0.80, None),
             ],
             
             "cvv": [
                 # CVV with context
                 (r'(?i)(?:cvv|cvc|cvv2|cvc2|security\s*code)[\s:]*([0-9]{3,4})',
-                 "Card security code (CVV)", SensitivityLevel.CRITICAL, 0.95),
+                 "Card security code (CVV)", SensitivityLevel.CRITICAL, 0.95, ("cvv", "cvc", "security")),
             ],
             
             # ============== IDENTITY ==============
             "ssn": [
                 # US Social Security Number
                 (r'\b[0-9]{3}[-\s][0-9]{2}[-\s][0-9]{4}\b',
-                 "Social Security Number", SensitivityLevel.CRITICAL, 0.95),
+                 "Social Security Number", SensitivityLevel.CRITICAL, 0.95, None),
                 # SSN with context
                 (r'(?i)(?:ssn|social\s*security)[\s:#]*([0-9]{3}[-\s]?[0-9]{2}[-\s]?[0-9]{4})',
-                 "SSN", SensitivityLevel.CRITICAL, 0.98),
+                 "SSN", SensitivityLevel.CRITICAL, 0.98, ("ssn", "social")),
             ],
             
             "nric": [
                 # Singapore NRIC/FIN
                 (r'\b[STFGM][0-9]{7}[A-Z]\b',
-                 "Singapore NRIC/FIN", SensitivityLevel.CRITICAL, 0.95),
+                 "Singapore NRIC/FIN", SensitivityLevel.CRITICAL, 0.95, None),
                 # Malaysia IC
                 (r'\b[0-9]{6}[-\s]?[0-9]{2}[-\s]?[0-9]{4}\b',
-                 "Malaysia IC", SensitivityLevel.CRITICAL, 0.80),
+                 "Malaysia IC", SensitivityLevel.CRITICAL, 0.80, None),
             ],
             
             "passport": [
                 # Generic passport with context
                 (r'(?i)passport[\s:#]*([A-Z]{1,2}[0-9]{6,9})',
-                 "Passport number", SensitivityLevel.HIGH, 0.85),
+                 "Passport number", SensitivityLevel.HIGH, 0.85, ("passport",)),
             ],
             
             "drivers_license": [
                 # With context
                 (r'(?i)(?:driver\'?s?\s*license|dl|license\s*#?)[\s:#]*([A-Z0-9]{5,15})',
-                 "Driver's license", SensitivityLevel.HIGH, 0.80),
+                 "Driver's license", SensitivityLevel.HIGH, 0.80, ("dl", "license")),
             ],
             
             # ============== AUTHENTICATION ==============
             "password": [
                 # Password with context
                 (r'(?i)password[\s:=]+\S+',
-                 "Password", SensitivityLevel.CRITICAL, 0.95),
+                 "Password", SensitivityLevel.CRITICAL, 0.95, ("password",)),
                 (r'(?i)(?:pwd|passwd)[\s:=]+\S+',
-                 "Password", SensitivityLevel.CRITICAL, 0.90),
+                 "Password", SensitivityLevel.CRITICAL, 0.90, ("pwd", "passwd")),
                 (r'(?i)pass[\s:=]+\S{6,}',
-                 "Password", SensitivityLevel.CRITICAL, 0.80),
+                 "Password", SensitivityLevel.CRITICAL, 0.80, ("pass",)),
             ],
             
             "pin": [
                 # PIN with context
                 (r'(?i)(?:pin|pin\s*code|pin\s*number)[\s:=]+[0-9]{4,6}',
-                 "PIN code", SensitivityLevel.CRITICAL, 0.95),
+                 "PIN code", SensitivityLevel.CRITICAL, 0.95, ("pin",)),
             ],
             
             "api_key": [
                 # API keys
                 (r'(?i)api[_-]?key[\s:=]+[A-Za-z0-9_\-]{20,}',
-                 "API Key", SensitivityLevel.CRITICAL, 0.95),
+                 "API Key", SensitivityLevel.CRITICAL, 0.95, ("api",)),
                 (r'(?i)secret[_-]?key[\s:=]+[A-Za-z0-9_\-]{20,}',
-                 "Secret Key", SensitivityLevel.CRITICAL, 0.95),
+                 "Secret Key", SensitivityLevel.CRITICAL, 0.95, ("secret",)),
                 (r'(?i)access[_-]?token[\s:=]+[A-Za-z0-9_\-]{20,}',
-                 "Access Token", SensitivityLevel.CRITICAL, 0.95),
+                 "Access Token", SensitivityLevel.CRITICAL, 0.95, ("access",)),
                 # Bearer tokens
                 (r'(?i)bearer[\s]+[A-Za-z0-9_\-\.]{20,}',
-                 "Bearer Token", SensitivityLevel.CRITICAL, 0.90),
+                 "Bearer Token", SensitivityLevel.CRITICAL, 0.90, ("bearer",)),
                 # AWS keys
                 (r'AKIA[0-9A-Z]{16}',
-                 "AWS Access Key", SensitivityLevel.CRITICAL, 0.98),
+                 "AWS Access Key", SensitivityLevel.CRITICAL, 0.98, ("akia",)),
             ],
             
             # ============== PERSONAL ==============
             "phone": [
                 # International format
                 (r'\+[1-9][0-9]{0,2}[-\s]?[0-9]{8,14}',
-                 "Phone number (international)", SensitivityLevel.MEDIUM, 0.85),
+                 "Phone number (international)", SensitivityLevel.MEDIUM, 0.85, ("+",)),
                 # US format
                 (r'\b\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b',
-                 "Phone number (US)", SensitivityLevel.MEDIUM, 0.80),
+                 "Phone number (US)", SensitivityLevel.MEDIUM, 0.80, None),
                 # Generic 10+ digits
                 (r'(?i)(?:phone|mobile|cell|tel)[\s:#]*([0-9\-\s]{10,})',
-                 "Phone number", SensitivityLevel.MEDIUM, 0.85),
+                 "Phone number", SensitivityLevel.MEDIUM, 0.85, ("phone", "mobile", "cell", "tel")),
             ],
             
             "email": [
                 # Standard email
                 (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-                 "Email address", SensitivityLevel.LOW, 0.95),
+                 "Email address", SensitivityLevel.LOW, 0.95, ("@",)),
             ],
             
             "address": [
                 # Street address with context
                 (r'(?i)(?:address|street|avenue|road|blvd|lane)[\s:#]*[0-9]+\s+[A-Za-z\s]+',
-                 "Physical address", SensitivityLevel.MEDIUM, 0.70),
+                 "Physical address", SensitivityLevel.MEDIUM, 0.70, ("address", "street", "avenue", "road", "blvd", "lane")),
             ],
             
             "dob": [
                 # Date of birth with context
                 (r'(?i)(?:dob|date\s*of\s*birth|born|birthday)[\s:]+[0-9]{1,2}[/\-][0-9]{1,2}[/\-][0-9]{2,4}',
-                 "Date of birth", SensitivityLevel.MEDIUM, 0.90),
+                 "Date of birth", SensitivityLevel.MEDIUM, 0.90, ("dob", "date", "born", "birthday")),
             ],
             
             # ============== MEDICAL ==============
             "medical": [
                 # Medical record number
                 (r'(?i)(?:mrn|medical\s*record|patient\s*id)[\s:#]*[A-Z0-9]{6,}',
-                 "Medical record number", SensitivityLevel.HIGH, 0.90),
+                 "Medical record number", SensitivityLevel.HIGH, 0.90, ("mrn", "medical", "patient")),
                 # Health information keywords
                 (r'(?i)(?:diagnosis|prescription|medication)[\s:]+[A-Za-z\s]+',
-                 "Health information", SensitivityLevel.HIGH, 0.70),
+                 "Health information", SensitivityLevel.HIGH, 0.70, ("diagnosis", "prescription", "medication")),
             ],
             
             # ============== IP/NETWORK ==============
             "ip_address": [
                 # IPv4
                 (r'\b(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\b',
-                 "IP Address (IPv4)", SensitivityLevel.MEDIUM, 0.90),
+                 "IP Address (IPv4)", SensitivityLevel.MEDIUM, 0.90, (".",)),
                 # IPv6 (simplified)
                 (r'\b(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}\b',
-                 "IP Address (IPv6)", SensitivityLevel.MEDIUM, 0.90),
+                 "IP Address (IPv6)", SensitivityLevel.MEDIUM, 0.90, (":",)),
             ],
         }
         
@@ -250,6 +322,58 @@ class DLPDetector:
             "ip_address": SensitivityLevel.MEDIUM,
             "email": SensitivityLevel.LOW,
         }
+        
+        self._compile_patterns()
+    
+    def _compile_patterns(self):
+        """Compile all patterns once"""
+        
+        # Flattened format: (category, compiled regex, description, sensitivity, confidence, keywords)
+        self._compiled: List[Tuple[str, Pattern, str, SensitivityLevel, float, Optional[Tuple[str, ...]]]] = [
+            (category, re.compile(pattern, re.IGNORECASE), description, sensitivity, confidence, keywords)
+            for category, patterns in self.patterns.items()
+            for pattern, description, sensitivity, confidence, keywords in patterns
+        ]
+        
+        # Same patterns compiled with re.ASCII, whose \b/\s/case handling skips
+        # the Unicode lookups. Only used on text where the result is identical.
+        self._compiled_ascii = [
+            (category, re.compile(regex.pattern, re.IGNORECASE | re.ASCII), *rest)
+            for category, regex, *rest in self._compiled
+        ]
+    
+    def _iter_matches(self, text: str) -> Iterator[Tuple[str, str, SensitivityLevel, float, Match]]:
+        """Lazily yield (category, description, sensitivity, confidence, match) for every raw regex hit"""
+        # Keyword gates check a lowercased copy of the text. For ASCII text that
+        # is exactly what re.IGNORECASE matches; other text is always scanned.
+        lowered = text.lower() if text.isascii() else None
+        
+        # ASCII-mode patterns behave identically on ASCII text, except that
+        # \s no longer matches the \x1c-\x1f separators; use them otherwise
+        if lowered is not None and not any(c in text for c in _ASCII_UNICODE_SPACES):
+            compiled = self._compiled_ascii
+        else:
+            compiled = self._compiled
+        
+        # Most messages have no digits at all; skip the digit-only categories
+        has_digit = _ASCII_DIGIT.search(text) is not None
+        
+        for category, regex, description, sensitivity, confidence, keywords in compiled:
+            if not has_digit and category in _DIGIT_CATEGORIES:
+                continue
+            if keywords and lowered is not None and not any(k in lowered for k in keywords):
+                continue
+            
+            for match in regex.finditer(text):
+                yield category, description, sensitivity, confidence, match
+    
+    def contains_sensitive_data(self, text: str) -> bool:
+        """Cheap yes/no check: stops at the first match analyze() would report"""
+        for category, _, _, _, match in self._iter_matches(text):
+            # Cards failing Luhn drop below the reporting threshold in analyze()
+            if category != "credit_card" or self._validate_luhn(match.group()):
+                return True
+        return False
     
     def analyze(self, text: str) -> Dict[str, Any]:
         """
@@ -267,102 +391,128 @@ class DLPDetector:
             - matches: list of match details
             - recommendation: str
         """
-        matches: List[Dict[str, Any]] = []
+        # Best match per (start, end) span, deduplicated as we scan
+        best: Dict[Tuple[int, int], SensitiveMatch] = {}
         categories_found: set = set()
         highest_sensitivity = SensitivityLevel.NONE
         
-        for category, patterns in self.patterns.items():
-            for pattern, description, sensitivity, confidence in patterns:
-                for match in re.finditer(pattern, text, re.IGNORECASE):
-                    matched_text = match.group()
-                    
-                    # Additional validation for credit cards
-                    if category == "credit_card" and not self._validate_luhn(matched_text):
-                        confidence *= 0.5
-                        if confidence < 0.5:
-                            continue
-                    
-                    # Create masked version
-                    masked = self._mask_text(matched_text, category)
-                    
-                    matches.append({
-                        "category": category,
-                        "description": description,
-                        "matched_text": matched_text,
-                        "masked_text": masked,
-                        "sensitivity": sensitivity.value,
-                        "confidence": round(confidence, 2),
-                        "position": {
-                            "start": match.start(),
-                            "end": match.end()
-                        }
-                    })
-                    
-                    categories_found.add(category)
-                    
-                    # Track highest sensitivity
-                    if self._sensitivity_rank(sensitivity) > self._sensitivity_rank(highest_sensitivity):
-                        highest_sensitivity = sensitivity
-        
-        # Remove duplicates (same position)
-        matches = self._deduplicate_matches(matches)
+        for category, description, sensitivity, confidence, match in self._iter_matches(text):
+            span = match.span()
+            existing = best.get(span)
+            
+            # A weaker pattern of the same category re-matching a claimed
+            # span (e.g. the generic 16-digit card after Visa) cannot win
+            # and adds no new category: skip validation and masking
+            if (existing is not None
+                    and existing.category == category
+                    and existing.sensitivity == sensitivity
+                    and existing.confidence >= round(confidence, 2)):
+                continue
+            
+            matched_text = match.group()
+            match_confidence = confidence
+            
+            # Additional validation for credit cards
+            if category == "credit_card" and not self._validate_luhn(matched_text):
+                match_confidence *= 0.5
+                if match_confidence < 0.5:
+                    continue
+            
+            categories_found.add(category)
+            
+            # Track highest sensitivity
+            if sensitivity.rank > highest_sensitivity.rank:
+                highest_sensitivity = sensitivity
+            
+            # Keep only the highest-confidence match at each position
+            # (the first pattern wins ties)
+            match_confidence = round(match_confidence, 2)
+            if existing is not None and existing.confidence >= match_confidence:
+                continue
+            
+            # Create masked version
+            masked = self._mask_text(matched_text, category)
+            
+            best[span] = SensitiveMatch(
+                category, description, matched_text, masked, sensitivity,
+                span[0], span[1], match_confidence
+            )
+    
+        # Serialize once, only for the matches that survived deduplication
+        matches = [match.to_dict() for match in self._suppress_contained(list(best.values()))]
         
         # Generate recommendation
-        recommendation = self._generate_recommendation(highest_sensitivity, list(categories_found))
+        categories = list(categories_found)
+        recommendation = self._generate_recommendation(highest_sensitivity, categories)
         
         return {
             "has_sensitive_data": len(matches) > 0,
             "sensitivity_level": highest_sensitivity.value,
             "total_matches": len(matches),
-            "categories": list(categories_found),
+            "categories": categories,
             "matches": matches,
             "recommendation": recommendation
         }
     
+    def _suppress_contained(self, matches: List[SensitiveMatch]) -> List[SensitiveMatch]:
+        """Drop matches lying inside another match of equal or higher sensitivity"""
+        if len(matches) < 2:
+            return matches
+        
+        # Sweep by start (longest first); max_end[r] is the furthest end seen
+        # so far among matches of rank r. Spans are unique, so any earlier
+        # match reaching m.end strictly contains m.
+        max_end = [-1] * (SensitivityLevel.CRITICAL.rank + 1)
+        dominated = set()
+        for m in sorted(matches, key=lambda m: (m.start_pos, -m.end_pos)):
+            rank = m.sensitivity.rank
+            if max(max_end[rank:]) >= m.end_pos:
+                dominated.add(id(m))
+            if m.end_pos > max_end[rank]:
+                max_end[rank] = m.end_pos
+        
+        if not dominated:
+            return matches
+        return [m for m in matches if id(m) not in dominated]
+    
     def _validate_luhn(self, card_number: str) -> bool:
         """Validate credit card using Luhn algorithm"""
-        digits = re.sub(r'[-\s]', '', card_number)
+        digits = _strip_separators(card_number)
         
-        if not digits.isdigit() or len(digits) < 13:
+        if not digits.isascii() or not digits.isdigit() or len(digits) < 13:
             return False
         
-        total = 0
-        reverse = digits[::-1]
-        
-        for i, digit in enumerate(reverse):
-            n = int(digit)
-            if i % 2 == 1:
-                n *= 2
-                if n > 9:
-                    n -= 9
-            total += n
+        # Every second digit from the right is doubled via the lookup table;
+        # summing the ASCII bytes (minus '0' per digit) avoids a per-digit loop
+        doubled = digits[-2::-2].translate(_LUHN_DOUBLED)
+        total = sum(digits[-1::-2].encode()) + sum(doubled.encode()) - 48 * len(digits)
         
         return total % 10 == 0
     
     def _mask_text(self, text: str, category: str) -> str:
         """Create masked version of sensitive data"""
         
-        clean = re.sub(r'[-\s]', '', text)
+        clean = _strip_separators(text)
         
-        if category in ["credit_card"]:
+        if category == "credit_card":
             # Show last 4 digits: ****-****-****-1234
             return f"****-****-****-{clean[-4:]}"
         
-        elif category in ["phone"]:
+        elif category == "phone":
             # Show last 4: ***-***-1234
             return f"***-***-{clean[-4:]}"
         
-        elif category in ["ssn"]:
+        elif category == "ssn":
             # Show last 4: ***-**-1234
             return f"***-**-{clean[-4:]}"
         
-        elif category in ["email"]:
+        elif category == "email":
             # Show first char and domain
             parts = text.split('@')
             if len(parts) == 2:
                 return f"{parts[0][0]}***@{parts[1]}"
         
-        elif category in ["password", "pin", "api_key", "cvv"]:
+        elif category in _FULLY_MASKED_CATEGORIES:
             # Fully mask
             return "*" * min(len(text), 12)
         
@@ -371,51 +521,20 @@ class DLPDetector:
             return text[:2] + "*" * (len(text) - 4) + text[-2:]
         return "*" * len(text)
     
-    def _deduplicate_matches(self, matches: List[Dict]) -> List[Dict]:
-        """Remove duplicate matches at same position"""
-        seen = set()
-        unique = []
-        
-        # Sort by confidence (highest first)
-        matches.sort(key=lambda x: x["confidence"], reverse=True)
-        
-        for match in matches:
-            key = (match["position"]["start"], match["position"]["end"])
-            if key not in seen:
-                seen.add(key)
-                unique.append(match)
-        
-        return unique
-    
     def _sensitivity_rank(self, level: SensitivityLevel) -> int:
         """Get numeric rank for sensitivity level"""
-        ranks = {
-            SensitivityLevel.NONE: 0,
-            SensitivityLevel.LOW: 1,
-            SensitivityLevel.MEDIUM: 2,
-            SensitivityLevel.HIGH: 3,
-            SensitivityLevel.CRITICAL: 4,
-        }
-        return ranks.get(level, 0)
+        return level.rank
     
     def _generate_recommendation(self, sensitivity: SensitivityLevel, categories: List[str]) -> str:
         """Generate user-friendly recommendation"""
         
-        if sensitivity == SensitivityLevel.NONE:
-            return "✅ No sensitive data detected. Safe to send."
-        
-        elif sensitivity == SensitivityLevel.LOW:
-            return "ℹ️ Low sensitivity data detected. Consider if the recipient needs this information."
-        
-        elif sensitivity == SensitivityLevel.MEDIUM:
-            return "⚠️ Medium sensitivity data detected. Verify you trust the recipient before sending."
-        
-        elif sensitivity == SensitivityLevel.HIGH:
-            return "🔶 High sensitivity data detected! Only send if absolutely necessary and to trusted recipients."
+        recommendation = _RECOMMENDATIONS.get(sensitivity)
+        if recommendation is not None:
+            return recommendation
         
-        else:  # CRITICAL
-            cat_str = ", ".join(categories[:3])
-            return f"🛑 CRITICAL: Highly sensitive data detected ({cat_str})! Strongly recommend NOT sending this information via this channel."
+        # CRITICAL
+        cat_str = ", ".join(categories[:3])
+        return f"🛑 CRITICAL: Highly sensitive data detected ({cat_str})! Strongly recommend NOT sending this information via this channel."
 
 
 # ============================================================
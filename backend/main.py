@@ -8,14 +8,20 @@ import sys
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from enum import Enum
-import json
 import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from functools import lru_cache
 
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Query
+from fastapi import FastAPI, HTTPException, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel, Field
+import orjson
 import uvicorn
 
 # Firebase Admin SDK for push notifications
@@ -23,7 +29,7 @@ import firebase_admin
 from firebase_admin import credentials, messaging
 
 # Database (using SQLite for simplicity, can be swapped for PostgreSQL)
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Text, Float, Enum as SQLEnum
+from sqlalchemy import create_engine, event, func, and_, or_, Column, Index, Integer, String, DateTime, Boolean, Text, Float, Enum as SQLEnum
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 
@@ -37,6 +43,19 @@ from dlp_detector import DLPDetector, SensitivityLevel
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sifitlier.db")
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+if "sqlite" in DATABASE_URL:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """WAL journal with relaxed fsync, larger page cache, wait on locks instead of failing"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-20000")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
 Base = declarative_base()
 
 
@@ -51,12 +70,18 @@ class MessageSource(str, Enum):
     TELEGRAM = "telegram"
 
 
+# Plain-string forms used on the request path, bound once
+_ALERT_SPAM = AlertType.SPAM.value
+_ALERT_DLP = AlertType.DLP.value
+_SOURCE_UPPER = {source: source.value.upper() for source in MessageSource}
+
+
 class Alert(Base):
     """Database model for storing alerts/logs"""
     __tablename__ = "alerts"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True)
+    user_id = Column(String)  # indexed via the composite indexes below
     device_token = Column(String, nullable=True)
     alert_type = Column(String)  # spam or dlp
     source = Column(String)  # sms, email, telegram
@@ -81,6 +106,13 @@ class Alert(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
     notification_sent = Column(Boolean, default=False)
     user_action = Column(String, nullable=True)  # allowed, blocked, reported
+    
+    __table_args__ = (
+        # Per-user time-window queries (stats, unfiltered history)
+        Index("ix_alerts_user_ts_type", "user_id", "timestamp", "alert_type"),
+        # History filtered by alert type, newest first
+        Index("ix_alerts_user_type_ts", "user_id", "alert_type", "timestamp"),
+    )
 
 
 class UserDevice(Base):
@@ -98,12 +130,20 @@ class UserDevice(Base):
 # Create tables
 Base.metadata.create_all(bind=engine)
 
+# create_all skips tables that already exist; add indexes introduced since
+for index in Alert.__table__.indexes:
+    index.create(bind=engine, checkfirst=True)
+
 
 # ============== Pydantic Models ==============
 
+# Longest message accepted for analysis; longer payloads are rejected with 422
+# before any model, regex or database work
+MAX_MESSAGE_LENGTH = int(os.getenv("MAX_MESSAGE_LENGTH", "16384"))
+
 class SpamCheckRequest(BaseModel):
     user_id: str
-    message: str
+    message: str = Field(..., min_length=1, max_length=MAX_MESSAGE_LENGTH)
     source: MessageSource
     sender: Optional[str] = None
     device_token: Optional[str] = None
@@ -120,7 +160,7 @@ class SpamCheckResponse(BaseModel):
 
 class DLPCheckRequest(BaseModel):
     user_id: str
-    message: str
+    message: str = Field(..., min_length=1, max_length=MAX_MESSAGE_LENGTH)
     source: MessageSource
     recipient: Optional[str] = None
     device_token: Optional[str] = None
@@ -175,6 +215,27 @@ spam_classifier: Optional[SpamClassifier] = None
 dlp_detector: Optional[DLPDetector] = None
 firebase_initialized = False
 
+# CPU-bound classifier/DLP work runs here, apart from the threadpool that
+# serves database I/O, so bursts of checks cannot starve alert reads
+ML_WORKERS = int(os.getenv("ML_WORKERS", str(os.cpu_count() or 1)))
+ml_executor: Optional[ThreadPoolExecutor] = None
+
+# Recent analysis results, keyed by message text; repeated/re-sent messages
+# skip the classifier and the DLP regex scan
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "4096"))
+
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def predict_spam_cached(message: str) -> Dict[str, Any]:
+    """spam_classifier.predict, memoized (treat the result as read-only)"""
+    return spam_classifier.predict(message)
+
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def analyze_dlp_cached(message: str) -> Dict[str, Any]:
+    """dlp_detector.analyze, memoized (treat the result as read-only)"""
+    return dlp_detector.analyze(message)
+
 
 def initialize_firebase():
     """Initialize Firebase Admin SDK for push notifications"""
@@ -215,17 +276,27 @@ def load_ml_models():
     # Initialize DLP detector
     dlp_detector = DLPDetector()
     print("✅ DLP detector initialized")
+    
+    # Results from previously loaded models are stale
+    predict_spam_cached.cache_clear()
+    analyze_dlp_cached.cache_clear()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler"""
+    global ml_executor
+    
     # Startup
+    ml_executor = ThreadPoolExecutor(max_workers=ML_WORKERS, thread_name_prefix="ml")
     load_ml_models()
     initialize_firebase()
+    if firebase_initialized:
+        start_push_worker()
     yield
     # Shutdown
-    pass
+    stop_push_worker()
+    ml_executor.shutdown(wait=True)
 
 
 # ============== FastAPI App ==============
@@ -234,7 +305,8 @@ app = FastAPI(
     title="Sifitlier API",
     description="AI-powered spam detection and data loss prevention API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -246,6 +318,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger bodies (alert lists, DLP match details) for mobile clients
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+def _preview(message: str, length: int = 100) -> str:
+    """First `length` characters of a message, with an ellipsis when cut"""
+    return message if len(message) <= length else message[:length] + "..."
+
+
+def _insert_alert(db: Session, alert: Alert) -> int:
+    """Store a new alert in a single commit and return its id"""
+    db.add(alert)
+    db.flush()
+    # Read the PK before commit: commit expires the instance, and touching it
+    # afterwards would cost a SELECT just like db.refresh()
+    alert_id = alert.id
+    db.commit()
+    return alert_id
+
 
 # Database dependency
 def get_db():
@@ -258,49 +349,97 @@ def get_db():
 
 # ============== Push Notification Service ==============
 
-async def send_push_notification(device_token: str, title: str, body: str, data: Dict = None):
-    """Send push notification via Firebase"""
+# Identical for every push; only the APNs alert carries the title/body
+_ANDROID_CONFIG = messaging.AndroidConfig(
+    priority="high",
+    notification=messaging.AndroidNotification(
+        channel_id="sifitlier_alerts",
+        priority="high",
+        default_sound=True,
+        default_vibrate_timings=True,
+    )
+)
+
+
+# FCM sends are blocking HTTP calls. Handlers only enqueue; one worker thread
+# drains the queue and sends whatever has accumulated in a single batch.
+FCM_BATCH_LIMIT = 500  # messaging.send_each maximum
+_push_queue: "queue.Queue[Optional[messaging.Message]]" = queue.Queue()
+_push_worker: Optional[threading.Thread] = None
+
+
+def send_push_notification(device_token: str, title: str, body: str, data: Dict = None) -> bool:
+    """Queue a push notification for the Firebase sender thread"""
     if not firebase_initialized:
         print("Push notifications disabled - Firebase not initialized")
         return False
     
-    try:
-        message = messaging.Message(
-            notification=messaging.Notification(
-                title=title,
-                body=body,
-            ),
-            data=data or {},
-            token=device_token,
-            android=messaging.AndroidConfig(
-                priority="high",
-                notification=messaging.AndroidNotification(
-                    channel_id="sifitlier_alerts",
-                    priority="high",
-                    default_sound=True,
-                    default_vibrate_timings=True,
-                )
-            ),
-            apns=messaging.APNSConfig(
-                payload=messaging.APNSPayload(
-                    aps=messaging.Aps(
-                        alert=messaging.ApsAlert(
-                            title=title,
-                            body=body,
-                        ),
-                        sound="default",
-                        badge=1,
-                    )
+    _push_queue.put(messaging.Message(
+        notification=messaging.Notification(
+            title=title,
+            body=body,
+        ),
+        data=data or {},
+        token=device_token,
+        android=_ANDROID_CONFIG,
+        apns=messaging.APNSConfig(
+            payload=messaging.APNSPayload(
+                aps=messaging.Aps(
+                    alert=messaging.ApsAlert(
+                        title=title,
+                        body=body,
+                    ),
+                    sound="default",
+                    badge=1,
                 )
             )
         )
+    ))
+    return True
+
+
+def _run_push_worker():
+    """Send queued notifications in batches until a None sentinel arrives"""
+    stopping = False
+    while not stopping:
+        message = _push_queue.get()
+        if message is None:
+            break
         
-        response = messaging.send(message)
-        print(f"✅ Push notification sent: {response}")
-        return True
-    except Exception as e:
-        print(f"❌ Failed to send push notification: {e}")
-        return False
+        batch = [message]
+        while len(batch) < FCM_BATCH_LIMIT:
+            try:
+                message = _push_queue.get_nowait()
+            except queue.Empty:
+                break
+            if message is None:
+                stopping = True
+                break
+            batch.append(message)
+        
+        try:
+            response = messaging.send_each(batch)
+            print(f"✅ Push notifications sent: {response.success_count}/{len(batch)}")
+        except Exception as e:
+            print(f"❌ Failed to send push notifications: {e}")
+
+
+def start_push_worker():
+    """Start the background push sender thread"""
+    global _push_worker
+    
+    _push_worker = threading.Thread(target=_run_push_worker, name="fcm-push", daemon=True)
+    _push_worker.start()
+
+
+def stop_push_worker():
+    """Flush queued notifications and stop the sender thread"""
+    global _push_worker
+    
+    if _push_worker is not None:
+        _push_queue.put(None)
+        _push_worker.join(timeout=10)
+        _push_worker = None
 
 
 # ============== API Endpoints ==============
@@ -323,7 +462,6 @@ async def root():
 @app.post("/api/v1/spam/check", response_model=SpamCheckResponse)
 async def check_spam(
     request: SpamCheckRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -337,41 +475,39 @@ async def check_spam(
         raise HTTPException(status_code=503, detail="Spam classifier not available")
     
     # Perform spam detection
-    result = spam_classifier.predict(request.message)
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(ml_executor, predict_spam_cached, request.message)
+    notify = bool(result['is_spam'] and request.device_token)
     
     # Create alert log
     alert = Alert(
         user_id=request.user_id,
         device_token=request.device_token,
-        alert_type=AlertType.SPAM.value,
+        alert_type=_ALERT_SPAM,
         source=request.source.value,
         direction="inbound",
-        message_preview=request.message[:100] + ("..." if len(request.message) > 100 else ""),
+        message_preview=_preview(request.message),
         full_message=request.message,
         sender=request.sender,
         is_spam=result['is_spam'],
         spam_confidence=result['confidence'],
         spam_risk_level=result['risk_level'],
+        notification_sent=notify,
     )
-    db.add(alert)
-    db.commit()
-    db.refresh(alert)
+    alert_id = await run_in_threadpool(_insert_alert, db, alert)
     
     # Send push notification if spam detected
-    if result['is_spam'] and request.device_token:
-        background_tasks.add_task(
-            send_push_notification,
+    if notify:
+        send_push_notification(
             request.device_token,
             "⚠️ Spam Alert",
-            f"Suspicious {request.source.value.upper()} detected from {request.sender or 'unknown'}",
+            f"Suspicious {_SOURCE_UPPER[request.source]} detected from {request.sender or 'unknown'}",
             {
-                "alert_id": str(alert.id),
+                "alert_id": str(alert_id),
                 "alert_type": "spam",
                 "risk_level": result['risk_level']
             }
         )
-        alert.notification_sent = True
-        db.commit()
     
     return SpamCheckResponse(
         is_spam=result['is_spam'],
@@ -379,14 +515,13 @@ async def check_spam(
         confidence=result['confidence'],
         spam_probability=result['spam_probability'],
         risk_level=result['risk_level'],
-        alert_id=alert.id
+        alert_id=alert_id
     )
 
 
 @app.post("/api/v1/dlp/check", response_model=DLPCheckResponse)
 async def check_dlp(
     request: DLPCheckRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -399,43 +534,41 @@ async def check_dlp(
         raise HTTPException(status_code=503, detail="DLP detector not available")
     
     # Perform DLP analysis
-    result = dlp_detector.analyze(request.message)
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(ml_executor, analyze_dlp_cached, request.message)
+    notify = bool(result['has_sensitive_data'] and request.device_token)
     
     # Create alert log
     alert = Alert(
         user_id=request.user_id,
         device_token=request.device_token,
-        alert_type=AlertType.DLP.value,
+        alert_type=_ALERT_DLP,
         source=request.source.value,
         direction="outbound",
-        message_preview=request.message[:100] + ("..." if len(request.message) > 100 else ""),
+        message_preview=_preview(request.message),
         full_message=request.message,
         recipient=request.recipient,
         has_sensitive_data=result['has_sensitive_data'],
         dlp_sensitivity_level=result['sensitivity_level'],
-        dlp_categories=json.dumps(result['categories']),
-        dlp_matches=json.dumps(result['matches']),
+        dlp_categories=orjson.dumps(result['categories']).decode(),
+        dlp_matches=orjson.dumps(result['matches']).decode(),
+        notification_sent=notify,
     )
-    db.add(alert)
-    db.commit()
-    db.refresh(alert)
+    alert_id = await run_in_threadpool(_insert_alert, db, alert)
     
     # Send push notification if sensitive data detected
-    if result['has_sensitive_data'] and request.device_token:
+    if notify:
         severity = "⚠️" if result['sensitivity_level'] in ['high', 'critical'] else "⚡"
-        background_tasks.add_task(
-            send_push_notification,
+        send_push_notification(
             request.device_token,
             f"{severity} Sensitive Data Warning",
-            f"Your {request.source.value.upper()} contains {result['sensitivity_level']} sensitivity data",
+            f"Your {_SOURCE_UPPER[request.source]} contains {result['sensitivity_level']} sensitivity data",
             {
-                "alert_id": str(alert.id),
+                "alert_id": str(alert_id),
                 "alert_type": "dlp",
                 "sensitivity_level": result['sensitivity_level']
             }
         )
-        alert.notification_sent = True
-        db.commit()
     
     return DLPCheckResponse(
         has_sensitive_data=result['has_sensitive_data'],
@@ -444,12 +577,12 @@ async def check_dlp(
         categories=result['categories'],
         matches=result['matches'],
         recommendation=result['recommendation'],
-        alert_id=alert.id
+        alert_id=alert_id
     )
 
 
 @app.post("/api/v1/device/register")
-async def register_device(
+def register_device(
     registration: DeviceRegistration,
     db: Session = Depends(get_db)
 ):
@@ -477,44 +610,58 @@ async def register_device(
 
 
 @app.get("/api/v1/alerts", response_model=List[AlertResponse])
-async def get_alerts(
+def get_alerts(
     user_id: str,
     alert_type: Optional[str] = None,
     source: Optional[str] = None,
     limit: int = Query(default=50, le=100),
     offset: int = 0,
+    before_ts: Optional[datetime] = None,
+    before_id: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
-    """Get alert history for a user"""
+    """
+    Get alert history for a user
+    
+    For deep pages pass the last row's timestamp/id as before_ts/before_id
+    (keyset pagination) instead of a growing offset.
+    """
     
-    query = db.query(Alert).filter(Alert.user_id == user_id)
+    # Only the AlertResponse columns: skips full_message and the DLP JSON blobs
+    query = db.query(
+        Alert.id,
+        Alert.alert_type,
+        Alert.source,
+        Alert.direction,
+        Alert.message_preview,
+        Alert.timestamp,
+        Alert.is_spam,
+        Alert.spam_risk_level,
+        Alert.has_sensitive_data,
+        Alert.dlp_sensitivity_level,
+    ).filter(Alert.user_id == user_id)
     
     if alert_type:
         query = query.filter(Alert.alert_type == alert_type)
     if source:
         query = query.filter(Alert.source == source)
+    if before_ts is not None:
+        if before_id is not None:
+            query = query.filter(or_(
+                Alert.timestamp < before_ts,
+                and_(Alert.timestamp == before_ts, Alert.id < before_id)
+            ))
+        else:
+            query = query.filter(Alert.timestamp < before_ts)
     
-    alerts = query.order_by(Alert.timestamp.desc()).offset(offset).limit(limit).all()
-    
-    return [
-        AlertResponse(
-            id=a.id,
-            alert_type=a.alert_type,
-            source=a.source,
-            direction=a.direction,
-            message_preview=a.message_preview,
-            timestamp=a.timestamp,
-            is_spam=a.is_spam,
-            spam_risk_level=a.spam_risk_level,
-            has_sensitive_data=a.has_sensitive_data,
-            dlp_sensitivity_level=a.dlp_sensitivity_level,
-        )
-        for a in alerts
-    ]
+    # id breaks timestamp ties so keyset pages neither skip nor repeat rows
+    rows = query.order_by(Alert.timestamp.desc(), Alert.id.desc()).offset(offset).limit(limit).all()
+    
+    return [AlertResponse(**row._mapping) for row in rows]
 
 
 @app.get("/api/v1/alerts/{alert_id}", response_model=AlertDetailResponse)
-async def get_alert_detail(
+def get_alert_detail(
     alert_id: int,
     user_id: str,
     db: Session = Depends(get_db)
@@ -542,8 +689,8 @@ async def get_alert_detail(
         spam_risk_level=alert.spam_risk_level,
         has_sensitive_data=alert.has_sensitive_data,
         dlp_sensitivity_level=alert.dlp_sensitivity_level,
-        dlp_categories=json.loads(alert.dlp_categories) if alert.dlp_categories else None,
-        dlp_matches=json.loads(alert.dlp_matches) if alert.dlp_matches else None,
+        dlp_categories=orjson.loads(alert.dlp_categories) if alert.dlp_categories else None,
+        dlp_matches=orjson.loads(alert.dlp_matches) if alert.dlp_matches else None,
         sender=alert.sender,
         recipient=alert.recipient,
         user_action=alert.user_action,
@@ -551,7 +698,7 @@ async def get_alert_detail(
 
 
 @app.put("/api/v1/alerts/{alert_id}")
-async def update_alert_action(
+def update_alert_action(
     alert_id: int,
     user_id: str,
     update: AlertUpdateRequest,
@@ -577,7 +724,7 @@ async def update_alert_action(
 
 
 @app.get("/api/v1/stats/{user_id}")
-async def get_user_stats(
+def get_user_stats(
     user_id: str,
     days: int = Query(default=30, le=365),
     db: Session = Depends(get_db)
@@ -586,50 +733,77 @@ async def get_user_stats(
     
     since = datetime.utcnow() - timedelta(days=days)
     
-    alerts = db.query(Alert).filter(
+    # One grouped scan in SQLite instead of loading every alert row
+    rows = db.query(
+        Alert.alert_type,
+        Alert.source,
+        Alert.is_spam,
+        Alert.spam_risk_level,
+        Alert.has_sensitive_data,
+        Alert.dlp_sensitivity_level,
+        func.count(),
+    ).filter(
         Alert.user_id == user_id,
         Alert.timestamp >= since
+    ).group_by(
+        Alert.alert_type,
+        Alert.source,
+        Alert.is_spam,
+        Alert.spam_risk_level,
+        Alert.has_sensitive_data,
+        Alert.dlp_sensitivity_level,
     ).all()
     
-    spam_alerts = [a for a in alerts if a.alert_type == AlertType.SPAM.value]
-    dlp_alerts = [a for a in alerts if a.alert_type == AlertType.DLP.value]
+    spam = {
+        "total": 0,
+        "detected": 0,
+        "by_source": {"sms": 0, "email": 0, "telegram": 0},
+        "by_risk_level": {"high": 0, "medium": 0, "low": 0},
+    }
+    dlp = {
+        "total": 0,
+        "with_sensitive_data": 0,
+        "by_sensitivity": {"critical": 0, "high": 0, "medium": 0, "low": 0},
+    }
+    total_alerts = 0
+    
+    for alert_type, source, is_spam, risk_level, has_sensitive_data, sensitivity_level, count in rows:
+        total_alerts += count
+        
+        if alert_type == _ALERT_SPAM:
+            spam["total"] += count
+            if is_spam:
+                spam["detected"] += count
+            if source in spam["by_source"]:
+                spam["by_source"][source] += count
+            if risk_level in spam["by_risk_level"]:
+                spam["by_risk_level"][risk_level] += count
+        
+        elif alert_type == _ALERT_DLP:
+            dlp["total"] += count
+            if has_sensitive_data:
+                dlp["with_sensitive_data"] += count
+            if sensitivity_level in dlp["by_sensitivity"]:
+                dlp["by_sensitivity"][sensitivity_level] += count
     
     return {
         "period_days": days,
-        "total_alerts": len(alerts),
-        "spam": {
-            "total": len(spam_alerts),
-            "detected": len([a for a in spam_alerts if a.is_spam]),
-            "by_source": {
-                "sms": len([a for a in spam_alerts if a.source == "sms"]),
-                "email": len([a for a in spam_alerts if a.source == "email"]),
-                "telegram": len([a for a in spam_alerts if a.source == "telegram"]),
-            },
-            "by_risk_level": {
-                "high": len([a for a in spam_alerts if a.spam_risk_level == "high"]),
-                "medium": len([a for a in spam_alerts if a.spam_risk_level == "medium"]),
-                "low": len([a for a in spam_alerts if a.spam_risk_level == "low"]),
-            }
-        },
-        "dlp": {
-            "total": len(dlp_alerts),
-            "with_sensitive_data": len([a for a in dlp_alerts if a.has_sensitive_data]),
-            "by_sensitivity": {
-                "critical": len([a for a in dlp_alerts if a.dlp_sensitivity_level == "critical"]),
-                "high": len([a for a in dlp_alerts if a.dlp_sensitivity_level == "high"]),
-                "medium": len([a for a in dlp_alerts if a.dlp_sensitivity_level == "medium"]),
-                "low": len([a for a in dlp_alerts if a.dlp_sensitivity_level == "low"]),
-            }
-        }
+        "total_alerts": total_alerts,
+        "spam": spam,
+        "dlp": dlp
     }
 
 
 # ============== Run Server ==============
 
 if __name__ == "__main__":
+    # uvicorn[standard] picks uvloop + httptools automatically where available.
+    # Reload (development) and multiple workers are mutually exclusive.
+    reload = os.getenv("UVICORN_RELOAD", "false").lower() in ("1", "true", "yes")
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        reload=reload,
+        workers=None if reload else int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
     )
\ No newline at end of file